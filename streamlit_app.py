@@ -1,8 +1,19 @@
 import streamlit as st
+import pandas as pd
 import os
+import random
+import time
+import functools
+import threading
 from supabase import create_client, Client
+from supabase.client import ClientOptions
+from postgrest.exceptions import APIError
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque
+from typing import List, Dict, Any, Optional, Tuple, Callable, Union
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -12,105 +23,361 @@ logger = logging.getLogger(__name__)
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+# PostgREST 요청 타임아웃(초)
+POSTGREST_TIMEOUT = 10
+
+# PostgREST HTTP/2 연결 풀 설정 (httpx 기본 keep-alive 만료는 5초라 유휴 후 연결을 다시 맺음)
+POSTGREST_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=60)
+
+# 재시도 설정: 요청이 처리되지 않았음이 확실한 오류(429, 연결 실패 PGRST00x)는 모든 요청에서,
+# 처리 여부가 불확실한 게이트웨이 오류(502/504)와 전송 오류는 멱등한 요청에서만 재시도
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.1
+RETRY_SAFE_CODES = {"429", "503", "PGRST000", "PGRST001", "PGRST002"}
+RETRY_IDEMPOTENT_CODES = RETRY_SAFE_CODES | {"502", "504"}
+
+# Postgres foreign_key_violation 오류 코드
+FK_VIOLATION = "23503"
+
+# 한 번에 보관하는 알림 메시지 최대 개수
+MESSAGE_LIMIT = 20
+
 # 상태 옵션
 CONDITION_OPTIONS = ["상", "중", "하"]
 
-# 데이터베이스 클라이언트 초기화 함수
-def initialize_db_client() -> Optional[Client]:
+# 화면별 조회 컬럼: 실제로 사용하는 컬럼만 요청
+PRODUCT_EDIT_COLUMNS = ("id, product_name, product_code, genuine_code, compatible_code, remarks, condition, image_url, "
+                        "brand_id, partgroup2_id, brands(brand_name), part_groups(group_name)")
+STOCK_EDIT_COLUMNS = "id, quantity, condition, remarks, image_url, product_id, products(product_name, product_code)"
+STOCK_SEARCH_COLUMNS = "id, quantity, condition, product_id"
+
+# 검색 결과 표 컬럼 순서 및 타입 (NULL 허용 정수형 사용)
+PRODUCT_SEARCH_DTYPES = {"product_name": "string", "product_code": "string", "brand": "category", "condition": "category"}
+STOCK_SEARCH_DTYPES = {"재고 ID": "Int64", "제품명": "string", "수량": "Int32", "상태": "category"}
+PARTGROUP_SEARCH_DTYPES = {"id": "Int64", "group_name": "string", "parent_id": "Int64"}
+
+# 드롭다운 조회 캐시 설정: 쓰기 시 무효화되는 테이블과 TTL(초)
+CACHED_TABLES = {"brands", "part_groups", "products"}
+CACHE_TTL = 300
+
+# 검색 결과 캐시 설정: 같은 검색어 반복 조회 시 메모리에서 반환
+SEARCH_CACHE_TTL = 60
+SEARCH_CACHE_MAX_ENTRIES = 256
+ILIKE_CONTAINS = "%{}%"
+
+# 병렬 조회 시 최대 스레드 수
+PARALLEL_FETCH_WORKERS = 4
+
+# 목록 페이지 크기 및 상품 선택 검색 최소 글자 수
+PAGE_SIZE = 50
+LOOKUP_MIN_CHARS = 2
+
+# in_ 필터 한 번에 넘길 최대 ID 수 (요청 URL 길이 제한 대비)
+IN_FILTER_CHUNK_SIZE = 500
+
+# 데이터베이스 클라이언트 생성 함수: 서버 프로세스 전체 세션이 하나의 클라이언트를 공유
+# SUPABASE_URL은 프로젝트 API URL(https://<ref>.supabase.co)을 사용한다. 이 클라이언트는 Postgres에 직접
+# 연결하지 않고 PostgREST(HTTPS)를 거치며, PostgREST가 DB 커넥션 풀을 유지하므로 Supavisor 풀러
+# 연결 문자열(postgres://...pooler.supabase.com)은 여기서 사용할 수 없다. 앱 쪽에서는 캐시된
+# 클라이언트 하나가 POSTGREST_HTTP_LIMITS 설정의 keep-alive HTTP/2 연결을 재사용한다.
+@st.cache_resource(show_spinner=False)
+def get_supabase_client() -> Optional[Client]:
     if not SUPABASE_URL or not SUPABASE_KEY:
         logger.error("Supabase URL 또는 Key가 설정되지 않았습니다.")
         st.error("환경 변수가 누락되었습니다. 관리자에게 문의하세요.")
         return None
     try:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        test_result = supabase.table("brands").select("id").limit(1).execute()
-        logger.info("데이터베이스 연결 성공")
+        http_client = httpx.Client(http2=True, limits=POSTGREST_HTTP_LIMITS, timeout=POSTGREST_TIMEOUT,
+                                   follow_redirects=True)
+        options = ClientOptions(postgrest_client_timeout=POSTGREST_TIMEOUT, httpx_client=http_client)
+        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
+        logger.info("데이터베이스 클라이언트 생성 성공")
         return supabase
     except Exception as e:
         logger.error(f"데이터베이스 연결 실패: {str(e)}")
         st.error("데이터베이스 연결에 실패했습니다.")
         return None
 
-# 데이터 가져오기 함수
-def get_data(supabase: Client, table: str, columns: str = "*", filters: Dict = None) -> List[Dict]:
+# PostgREST 429/5xx 오류 시 지수 백오프로 재시도하는 데코레이터
+def retry_supabase(retry_codes: set = RETRY_IDEMPOTENT_CODES,
+                   transport_errors: Tuple[type, ...] = (httpx.TransportError,)) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(RETRY_MAX_ATTEMPTS):
+                try:
+                    return func(*args, **kwargs)
+                except (APIError, *transport_errors) as e:
+                    retryable = str(e.code) in retry_codes if isinstance(e, APIError) else True
+                    if not retryable or attempt == RETRY_MAX_ATTEMPTS - 1:
+                        raise
+                    delay = RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, RETRY_BASE_DELAY)
+                    logger.warning(f"Supabase 요청 재시도 {attempt + 1}/{RETRY_MAX_ATTEMPTS - 1} ({delay:.2f}초 후): {str(e)}")
+                    time.sleep(delay)
+        return wrapper
+    return decorator
+
+# postgrest-py 자체 재시도(GET/HEAD 503)를 끄고 앱의 백오프만 적용해 재시도 횟수가 곱해지지 않게 함
+# 조회/ID 기준 수정·삭제 실행: 여러 번 실행해도 결과가 같으므로 모든 재시도 대상 오류에서 재시도
+@retry_supabase()
+def execute_query(query):
+    return query.retry(False).execute()
+
+# 삽입 실행: ID를 DB가 생성하므로 중복 삽입을 막기 위해 요청이 처리되지 않은 것이 확실한 경우에만 재시도
+@retry_supabase(RETRY_SAFE_CODES, (httpx.ConnectError, httpx.ConnectTimeout))
+def execute_insert(query):
+    return query.retry(False).execute()
+
+# 데이터 가져오기 함수: fetch_rows는 실패 시 예외를 그대로 던짐 (캐시된 조회 함수에서 사용)
+def fetch_rows(supabase: Client, table: str, columns: str, filters: Dict = None) -> List[Dict]:
+    query = supabase.table(table).select(columns)
+    if filters:
+        for key, value in filters.items():
+            if value is not None:
+                query = query.eq(key, value)
+    return execute_query(query).data
+
+def get_data(supabase: Client, table: str, columns: str, filters: Dict = None) -> List[Dict]:
     try:
-        query = supabase.table(table).select(columns)
-        if filters:
-            for key, value in filters.items():
-                if value is not None:
-                    query = query.eq(key, value)
-        response = query.execute()
-        return response.data
+        return fetch_rows(supabase, table, columns, filters)
     except Exception as e:
         logger.error(f"{table} 데이터 조회 실패: {str(e)}")
         return []
 
-def get_brands(supabase: Client) -> List[Dict]:
-    return get_data(supabase, "brands", "id, brand_name")
+# 상품 선택용 검색: 전체 목록 대신 이름이 일치하는 상품을 최대 PAGE_SIZE개만 조회
+# 결과가 캐시되므로 실패 시 빈 결과 대신 예외를 던짐 (화면의 try 블록에서 처리)
+@st.cache_data(ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES, show_spinner=False)
+def lookup_products(_supabase: Client, query: str) -> List[Dict]:
+    response = execute_query(_supabase.table("products").select("id, product_name, product_code")
+                             .ilike("product_name", ILIKE_CONTAINS.format(query.strip())).limit(PAGE_SIZE))
+    return response.data
+
+# 재고 목록 페이지 조회: 빈 페이지와 조회 실패를 구분하도록 실패 시 예외를 그대로 던짐
+def get_stock_page(supabase: Client, offset: int) -> List[Dict]:
+    response = execute_query(supabase.table("stock").select(STOCK_EDIT_COLUMNS).order("id")
+                             .range(offset, offset + PAGE_SIZE - 1))
+    return response.data
+
+# 조건에 맞는 행 수만 조회 (head=True로 행 데이터는 받지 않음)
+def count_data(supabase: Client, table: str, filters: Dict) -> int:
+    try:
+        query = supabase.table(table).select("id", count="exact", head=True)
+        for key, value in filters.items():
+            if value is not None:
+                query = query.eq(key, value)
+        return execute_query(query).count or 0
+    except Exception as e:
+        logger.error(f"{table} 개수 조회 실패: {str(e)}")
+        return 0
 
-def get_partgroup1(supabase: Client) -> List[Dict]:
-    return get_data(supabase, "part_groups", "id, group_name", {"parent_id": None})
+# 조건에 맞는 행이 하나라도 있는지 확인 (삭제 전 참조 데이터 확인용)
+def exists(supabase: Client, table: str, filters: Dict) -> bool:
+    return count_data(supabase, table, filters) > 0
 
-def get_partgroup2(supabase: Client, partgroup1_id: int) -> List[Dict]:
-    if partgroup1_id is None:
-        return []
-    return get_data(supabase, "part_groups", "id, group_name", {"parent_id": partgroup1_id})
-
-# 검색 기능
-def search_data(supabase: Client, table: str, search_term: str) -> List[Dict]:
+# 여러 상품의 재고를 상품별 반복 조회 대신 in_ 필터로 한 번에 조회
+def get_stock_by_product_ids(supabase: Client, product_ids: List[int], columns: str) -> List[Dict]:
+    results = []
     try:
-        search_term = search_term.strip().lower()
-        if not search_term:
-            return []
-        response = supabase.table(table).select("*").or_(
-            f"product_name.ilike.%{search_term}%,product_code.ilike.%{search_term}%,"
-            f"genuine_code.ilike.%{search_term}%,compatible_code.ilike.%{search_term}%"
-        ).execute()
-        return response.data
+        for i in range(0, len(product_ids), IN_FILTER_CHUNK_SIZE):
+            chunk = product_ids[i:i + IN_FILTER_CHUNK_SIZE]
+            response = execute_query(supabase.table("stock").select(columns).in_("product_id", chunk))
+            results.extend(response.data)
+        return results
     except Exception as e:
-        logger.error(f"검색 실패: {str(e)}")
+        logger.error(f"stock 데이터 조회 실패: {str(e)}")
         return []
 
-def search_partgroup(supabase: Client, search_term: str, is_group1: bool = True) -> List[Dict]:
+# 드롭다운 조회 함수: Client는 해시할 수 없으므로 _supabase로 받아 캐시 키에서 제외
+# st.cache_data는 예외를 캐시하지 않으므로, 일시적 오류의 빈 결과가 모든 세션에 캐시되지 않도록
+# 실패 시 예외를 던지고 호출하는 쪽(load_lookup 또는 화면의 try 블록)에서 처리
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def get_brands(_supabase: Client) -> List[Dict]:
+    return fetch_rows(_supabase, "brands", "id, brand_name")
+
+# 부품 그룹을 parent_id별로 묶음: {None: 그룹 1 목록, 그룹 1 ID: 하위 그룹 2 목록}
+def group_by_parent(groups: List[Dict]) -> Dict[Optional[int], List[Dict]]:
+    tree = defaultdict(list)
+    for group in groups:
+        tree[group["parent_id"]].append(group)
+    return dict(tree)
+
+# 부품 그룹 전체를 한 번에 조회해 트리로 반환
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def get_part_groups_tree(_supabase: Client) -> Dict[Optional[int], List[Dict]]:
+    return group_by_parent(fetch_rows(_supabase, "part_groups", "id, group_name, parent_id"))
+
+# 상품 폼 드롭다운 데이터(브랜드, 부품 그룹 트리)를 get_form_bootstrap RPC 한 번으로 조회
+# (supabase/migrations/20261015000200_form_bootstrap.sql, 20261015000400_form_bootstrap_private.sql)
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def get_form_bootstrap(_supabase: Client) -> Tuple[List[Dict], Dict[Optional[int], List[Dict]]]:
+    payload = execute_query(_supabase.rpc("get_form_bootstrap", {})).data or {}
+    return payload.get("brands", []), group_by_parent(payload.get("part_groups", []))
+
+# 캐시된 조회 함수 호출: 실패하면 오류를 표시하고 기본값으로 대체 (실패 결과는 캐시되지 않음)
+def load_lookup(fetch: Callable[[Client], Any], supabase: Client, default: Any) -> Any:
     try:
-        search_term = search_term.strip().lower()
-        if not search_term:
-            return []
-        query = supabase.table("part_groups").select("id, group_name, parent_id").ilike("group_name", f"%{search_term}%")
-        if is_group1:
-            query = query.is_("parent_id", None)
-        else:
-            query = query.not_.is_("parent_id", None)
-        response = query.execute()
-        return response.data
+        return fetch(supabase)
     except Exception as e:
-        logger.error(f"부품 그룹 검색 실패: {str(e)}")
+        logger.error(f"{fetch.__name__} 조회 실패: {str(e)}")
+        st.error("데이터를 불러오지 못했습니다. 잠시 후 다시 시도해주세요.")
+        return default
+
+# 서로 독립적인 조회를 동시에 실행하고 이름별 결과를 반환
+def parallel_fetch(**fns: Callable[[], Any]) -> Dict[str, Any]:
+    with ThreadPoolExecutor(max_workers=PARALLEL_FETCH_WORKERS) as executor:
+        futures = {name: executor.submit(fn) for name, fn in fns.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+# 행 목록과 키(컬럼명 또는 함수) → 행 딕셔너리를 한 번에 만들어 선택값 역조회를 O(1)로 처리
+def indexed(rows: List[Dict], key: Union[str, Callable[[Dict], Any]]) -> Tuple[List[Dict], Dict[Any, Dict]]:
+    key_fn = key if callable(key) else (lambda r: r[key])
+    return rows, {key_fn(r): r for r in rows}
+
+def product_label(product: Dict) -> str:
+    return f"{product['product_name']} ({product['product_code']})"
+
+# 레코드 목록을 지정한 컬럼 순서와 타입의 DataFrame으로 변환
+def to_dataframe(records: List[Dict], dtypes: Dict[str, str]) -> pd.DataFrame:
+    return pd.DataFrame.from_records(records, columns=list(dtypes)).astype(dtypes)
+
+# 캐시 무효화 세대 번호: 스크립트 재실행과 무관하게 프로세스 전체 세션이 공유
+@st.cache_resource(show_spinner=False)
+def get_cache_generation() -> Dict[str, int]:
+    return {"value": 0}
+
+# 드롭다운 조회 캐시를 백그라운드 스레드에서 미리 채움: 사용자가 다른 화면의 폼을 열 때 캐시가 이미 준비됨
+# 스레드 하나에서 순서대로 조회하므로 모든 조회가 스크립트 실행 컨텍스트를 가짐
+def prefetch_lookups(supabase: Client) -> None:
+    generation = get_cache_generation()
+
+    def warm():
+        for fetch in (get_form_bootstrap, get_part_groups_tree, get_brands):
+            started = generation["value"]
+            try:
+                fetch(supabase)
+            except Exception as e:
+                logger.warning(f"{fetch.__name__} 미리 가져오기 실패: {str(e)}")
+                continue
+            # 조회 도중 다른 곳의 쓰기로 캐시가 무효화되었다면 쓰기 이전 데이터가 저장되었을 수 있으므로 비움
+            if generation["value"] != started:
+                fetch.clear()
+
+    thread = threading.Thread(target=warm, name="prefetch_lookups", daemon=True)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+
+# 캐시 무효화: 드롭다운 대상 테이블에 쓰기가 발생하면 캐시와 세션의 최근 검색 결과를 비움
+def invalidate_cache(table: str) -> None:
+    if table in CACHED_TABLES:
+        get_cache_generation()["value"] += 1
+        st.cache_data.clear()
+        st.session_state.last_searches.clear()
+
+# 검색어 정규화 결과를 메모이즈
+@functools.lru_cache(maxsize=SEARCH_CACHE_MAX_ENTRIES)
+def normalize_search_term(search_term: str) -> str:
+    return search_term.strip().lower()
+
+# 세션별 최근 검색 결과 재사용: 다른 위젯 때문에 다시 실행되어도 검색어가 같으면 조회를 생략
+# 다른 세션의 쓰기는 이 값을 지우지 못하므로 SEARCH_CACHE_TTL이 지나거나 검색 버튼을 누르면 다시 조회
+def session_search(key: str, search_term: str, fetch: Callable[[str], List[Dict]], refresh: bool = False) -> List[Dict]:
+    term = normalize_search_term(search_term)
+    last = st.session_state.last_searches.get(key)
+    if not refresh and last is not None and last[0] == term and time.monotonic() - last[1] < SEARCH_CACHE_TTL:
+        return last[2]
+    results = fetch(term)
+    st.session_state.last_searches[key] = (term, time.monotonic(), results)
+    return results
+
+# 검색 기능: 트라이그램 인덱스를 사용하는 search_products RPC 호출
+# 반환 컬럼: id, product_name, product_code, brand_id, condition
+# (supabase/migrations/20261015000000_search_products.sql, 20261015000300_search_products_columns.sql)
+# 검색 결과도 캐시되므로 실패 시 빈 결과 대신 예외를 던짐 (화면의 try 블록에서 처리)
+@st.cache_data(ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES, show_spinner=False)
+def search_data(_supabase: Client, search_term: str) -> List[Dict]:
+    search_term = normalize_search_term(search_term)
+    if not search_term:
+        return []
+    response = execute_query(_supabase.rpc("search_products", {"term": search_term}))
+    return response.data
+
+@st.cache_data(ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES, show_spinner=False)
+def search_partgroup(_supabase: Client, search_term: str, is_group1: bool = True) -> List[Dict]:
+    search_term = normalize_search_term(search_term)
+    if not search_term:
         return []
+    query = _supabase.table("part_groups").select("id, group_name, parent_id").ilike("group_name", ILIKE_CONTAINS.format(search_term))
+    if is_group1:
+        query = query.is_("parent_id", None)
+    else:
+        query = query.not_.is_("parent_id", None)
+    response = execute_query(query)
+    return response.data
 
 # 데이터베이스 작업 함수
 def insert_data(supabase: Client, table: str, data: Dict) -> bool:
     try:
-        result = supabase.table(table).insert(data).execute()
+        result = execute_insert(supabase.table(table).insert(data))
+        invalidate_cache(table)
         return bool(result.data)
     except Exception as e:
         logger.error(f"{table} 데이터 삽입 실패: {str(e)}")
         return False
 
+# 여러 행을 한 번의 요청으로 삽입/업서트
+def insert_many(supabase: Client, table: str, rows: List[Dict]) -> bool:
+    if not rows:
+        return True
+    try:
+        result = execute_insert(supabase.table(table).insert(rows))
+        invalidate_cache(table)
+        return len(result.data) == len(rows)
+    except Exception as e:
+        logger.error(f"{table} 데이터 {len(rows)}건 일괄 삽입 실패: {str(e)}")
+        return False
+
+def upsert_many(supabase: Client, table: str, rows: List[Dict], on_conflict: str = "id") -> bool:
+    if not rows:
+        return True
+    try:
+        query = supabase.table(table).upsert(rows, on_conflict=on_conflict)
+        # 충돌 키가 없는 행은 일반 삽입이 되므로, 모든 행에 충돌 키가 있을 때만 멱등 요청으로 재시도
+        if all(row.get(on_conflict) is not None for row in rows):
+            result = execute_query(query)
+        else:
+            result = execute_insert(query)
+        invalidate_cache(table)
+        return len(result.data) == len(rows)
+    except Exception as e:
+        logger.error(f"{table} 데이터 {len(rows)}건 일괄 업서트 실패: {str(e)}")
+        return False
+
 def update_data(supabase: Client, table: str, data: Dict, id: int) -> bool:
     try:
-        result = supabase.table(table).update(data).eq("id", id).execute()
+        result = execute_query(supabase.table(table).update(data).eq("id", id))
+        invalidate_cache(table)
         return bool(result.data)
     except Exception as e:
         logger.error(f"{table} ID {id} 데이터 업데이트 실패: {str(e)}")
         return False
 
-def delete_data(supabase: Client, table: str, id: int) -> bool:
+# 삭제 결과를 (성공 여부, 오류 메시지)로 반환: 참조 중인 행은 DB의 FK 제약이 삭제를 막음
+def delete_data(supabase: Client, table: str, id: int) -> Tuple[bool, str]:
     try:
-        result = supabase.table(table).delete().eq("id", id).execute()
-        return bool(result.data)
+        result = execute_query(supabase.table(table).delete().eq("id", id))
+        invalidate_cache(table)
+        if not result.data:
+            return False, "삭제할 데이터가 없습니다."
+        return True, ""
+    except APIError as e:
+        if e.code == FK_VIOLATION:
+            logger.info(f"{table} ID {id} 참조 데이터가 있어 삭제 거부됨")
+            return False, "연결된 데이터가 있어 삭제할 수 없습니다."
+        logger.error(f"{table} ID {id} 데이터 삭제 실패: {str(e)}")
+        return False, "삭제에 실패했습니다."
     except Exception as e:
         logger.error(f"{table} ID {id} 데이터 삭제 실패: {str(e)}")
-        return False
+        return False, "삭제에 실패했습니다."
 
 # 데이터 검증 함수
 def validate_product_data(data: Dict) -> Tuple[bool, str]:
@@ -126,10 +393,15 @@ def validate_stock_data(data: Dict) -> Tuple[bool, str]:
     return True, ""
 
 # 상태 초기화
-if "supabase" not in st.session_state:
-    st.session_state.supabase = initialize_db_client()
+supabase = get_supabase_client()
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = deque(maxlen=MESSAGE_LIMIT)
+if "stock_offset" not in st.session_state:
+    st.session_state.stock_offset = 0
+if "last_searches" not in st.session_state:
+    st.session_state.last_searches = {}
+if "prefetched" not in st.session_state:
+    st.session_state.prefetched = False
 
 # 상품 관리 화면
 def product_management(supabase: Client):
@@ -138,24 +410,25 @@ def product_management(supabase: Client):
 
     with tab1:
         with st.form("product_form"):
-            brands = get_brands(supabase)
+            brands, groups = load_lookup(get_form_bootstrap, supabase, ([], {}))
+            _, brands_by_name = indexed(brands, "brand_name")
             brand_id = None
             if brands:
-                brand_name = st.selectbox("브랜드", [b["brand_name"] for b in brands])
-                brand_id = next((b["id"] for b in brands if b["brand_name"] == brand_name), None)
+                brand_name = st.selectbox("브랜드", list(brands_by_name))
+                brand_id = brands_by_name[brand_name]["id"]
             else:
                 st.warning("등록된 브랜드가 없습니다.")
 
-            partgroup1_list = get_partgroup1(supabase)
+            partgroup1_list, partgroup1_by_name = indexed(groups.get(None, []), "group_name")
             partgroup1_id = None
             partgroup2_id = None
             if partgroup1_list:
-                partgroup1_name = st.selectbox("부품 그룹 1", [pg["group_name"] for pg in partgroup1_list])
-                partgroup1_id = next((pg["id"] for pg in partgroup1_list if pg["group_name"] == partgroup1_name), None)
-                partgroup2_list = get_partgroup2(supabase, partgroup1_id)
+                partgroup1_name = st.selectbox("부품 그룹 1", list(partgroup1_by_name))
+                partgroup1_id = partgroup1_by_name[partgroup1_name]["id"]
+                partgroup2_list, partgroup2_by_name = indexed(groups.get(partgroup1_id, []), "group_name")
                 if partgroup2_list:
-                    partgroup2_name = st.selectbox("부품 그룹 2", [pg["group_name"] for pg in partgroup2_list])
-                    partgroup2_id = next((pg["id"] for pg in partgroup2_list if pg["group_name"] == partgroup2_name), None)
+                    partgroup2_name = st.selectbox("부품 그룹 2", list(partgroup2_by_name))
+                    partgroup2_id = partgroup2_by_name[partgroup2_name]["id"]
                 else:
                     st.warning(f"'{partgroup1_name}'에 속한 부품 그룹 2가 없습니다.")
             else:
@@ -188,75 +461,94 @@ def product_management(supabase: Client):
 
     with tab2:
         try:
-            products = get_data(supabase, "products", "*, brands(brand_name), part_groups(group_name)")
-            if products:
-                selected_product = st.selectbox("상품 선택", [p["product_name"] for p in products])
-                product_data = next((p for p in products if p["product_name"] == selected_product), None)
-                if product_data:
-                    with st.form("update_product_form"):
-                        brands = get_brands(supabase)
-                        brand_name = st.selectbox("브랜드", [b["brand_name"] for b in brands],
-                                                  index=[b["brand_name"] for b in brands].index(product_data["brands"]["brand_name"]))
-                        brand_id = next((b["id"] for b in brands if b["brand_name"] == brand_name), None)
-
-                        partgroup1_list = get_partgroup1(supabase)
-                        partgroup1_name = st.selectbox("부품 그룹 1", [pg["group_name"] for pg in partgroup1_list])
-                        partgroup1_id = next((pg["id"] for pg in partgroup1_list if pg["group_name"] == partgroup1_name), None)
-                        partgroup2_list = get_partgroup2(supabase, partgroup1_id)
-                        partgroup2_name = st.selectbox("부품 그룹 2", [pg["group_name"] for pg in partgroup2_list],
-                                                       index=[pg["group_name"] for pg in partgroup2_list].index(product_data["part_groups"]["group_name"]))
-                        partgroup2_id = next((pg["id"] for pg in partgroup2_list if pg["group_name"] == partgroup2_name), None)
-
-                        product_name = st.text_input("제품명", product_data["product_name"])
-                        product_code = st.text_input("제품번호", product_data["product_code"])
-                        genuine_code = st.text_input("정품번호", product_data["genuine_code"])
-                        compatible_code = st.text_input("호환번호", product_data["compatible_code"])
-                        remarks = st.text_area("비고", product_data["remarks"])
-                        condition = st.selectbox("상태", CONDITION_OPTIONS, index=CONDITION_OPTIONS.index(product_data["condition"]))
-                        image_url = st.text_input("이미지 URL", product_data["image_url"])
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            update = st.form_submit_button("업데이트")
-                        with col2:
-                            delete = st.form_submit_button("삭제")
-
-                        if update:
-                            data = {
-                                "product_name": product_name, "product_code": product_code,
-                                "genuine_code": genuine_code, "compatible_code": compatible_code,
-                                "brand_id": brand_id, "partgroup2_id": partgroup2_id,
-                                "remarks": remarks, "condition": condition, "image_url": image_url
-                            }
-                            is_valid, error_msg = validate_product_data(data)
-                            if is_valid and update_data(supabase, "products", data, product_data["id"]):
-                                st.session_state.messages.append("상품이 성공적으로 업데이트되었습니다!")
-                            else:
-                                st.session_state.messages.append(error_msg)
-                        if delete:
-                            if get_data(supabase, "stock", "*", {"product_id": product_data["id"]}):
-                                st.session_state.messages.append("연결된 재고가 있어 삭제할 수 없습니다.")
-                            elif delete_data(supabase, "products", product_data["id"]):
-                                st.session_state.messages.append("상품이 성공적으로 삭제되었습니다!")
+            query = st.text_input(f"상품 검색 ({LOOKUP_MIN_CHARS}자 이상)", key="product_lookup")
+            if len(query.strip()) >= LOOKUP_MIN_CHARS:
+                matches = lookup_products(supabase, query)
+                if matches:
+                    _, matches_by_label = indexed(matches, product_label)
+                    selected_label = st.selectbox("상품 선택", list(matches_by_label))
+                    selected_id = matches_by_label[selected_label]["id"]
+                    res = parallel_fetch(
+                        product=lambda: get_data(supabase, "products", PRODUCT_EDIT_COLUMNS, {"id": selected_id}),
+                        bootstrap=lambda: get_form_bootstrap(supabase),
+                    )
+                    product_data = next(iter(res["product"]), None)
+                    brands, groups = res["bootstrap"]
+                    if product_data:
+                        with st.form("update_product_form"):
+                            _, brands_by_name = indexed(brands, "brand_name")
+                            brand_names = list(brands_by_name)
+                            brand_name = st.selectbox("브랜드", brand_names,
+                                                      index=brand_names.index(product_data["brands"]["brand_name"]))
+                            brand_id = brands_by_name[brand_name]["id"]
+
+                            _, partgroup1_by_name = indexed(groups.get(None, []), "group_name")
+                            partgroup1_name = st.selectbox("부품 그룹 1", list(partgroup1_by_name))
+                            partgroup1_id = partgroup1_by_name[partgroup1_name]["id"]
+                            _, partgroup2_by_name = indexed(groups.get(partgroup1_id, []), "group_name")
+                            partgroup2_names = list(partgroup2_by_name)
+                            partgroup2_name = st.selectbox("부품 그룹 2", partgroup2_names,
+                                                           index=partgroup2_names.index(product_data["part_groups"]["group_name"]))
+                            partgroup2_id = partgroup2_by_name[partgroup2_name]["id"]
+
+                            product_name = st.text_input("제품명", product_data["product_name"])
+                            product_code = st.text_input("제품번호", product_data["product_code"])
+                            genuine_code = st.text_input("정품번호", product_data["genuine_code"])
+                            compatible_code = st.text_input("호환번호", product_data["compatible_code"])
+                            remarks = st.text_area("비고", product_data["remarks"])
+                            condition = st.selectbox("상태", CONDITION_OPTIONS, index=CONDITION_OPTIONS.index(product_data["condition"]))
+                            image_url = st.text_input("이미지 URL", product_data["image_url"])
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                update = st.form_submit_button("업데이트")
+                            with col2:
+                                delete = st.form_submit_button("삭제")
+
+                            if update:
+                                data = {
+                                    "product_name": product_name, "product_code": product_code,
+                                    "genuine_code": genuine_code, "compatible_code": compatible_code,
+                                    "brand_id": brand_id, "partgroup2_id": partgroup2_id,
+                                    "remarks": remarks, "condition": condition, "image_url": image_url
+                                }
+                                is_valid, error_msg = validate_product_data(data)
+                                if is_valid and update_data(supabase, "products", data, product_data["id"]):
+                                    st.session_state.messages.append("상품이 성공적으로 업데이트되었습니다!")
+                                else:
+                                    st.session_state.messages.append(error_msg)
+                            if delete:
+                                if exists(supabase, "stock", {"product_id": product_data["id"]}):
+                                    st.session_state.messages.append("연결된 재고가 있어 삭제할 수 없습니다.")
+                                else:
+                                    is_deleted, error_msg = delete_data(supabase, "products", product_data["id"])
+                                    st.session_state.messages.append("상품이 성공적으로 삭제되었습니다!" if is_deleted else error_msg)
+                else:
+                    st.warning("검색된 상품이 없습니다.")
             else:
-                st.warning("등록된 상품이 없습니다.")
+                st.info(f"상품명을 {LOOKUP_MIN_CHARS}자 이상 입력하세요.")
         except Exception as e:
-            st.session_state.messages.append(f"업데이트/삭제 오류: {str(e)}")
+            st.error(f"업데이트/삭제 오류: {str(e)}")
 
     with tab3:
-        search_term = st.text_input("검색어 입력")
+        # 폼 제출 시에만 검색어가 반영되어 키 입력마다 조회하지 않음
+        with st.form("product_search_form"):
+            search_term = st.text_input("검색어 입력")
+            submitted = st.form_submit_button("검색")
         if search_term:
             try:
-                results = search_data(supabase, "products", search_term)
+                results = session_search("products", search_term, lambda term: search_data(supabase, term), submitted)
                 if results:
-                    brands = {b["id"]: b["brand_name"] for b in get_brands(supabase)}
+                    _, brands_by_id = indexed(get_brands(supabase), "id")
                     display_data = [{"product_name": r["product_name"], "product_code": r["product_code"],
-                                     "brand": brands.get(r["brand_id"], "알 수 없음"), "condition": r["condition"]} for r in results]
-                    st.dataframe(display_data)
-                    st.session_state.messages.append(f"총 {len(results)}개의 결과가 검색되었습니다.")
-                else:
+                                     "brand": brands_by_id.get(r["brand_id"], {}).get("brand_name", "알 수 없음"),
+                                     "condition": r["condition"]} for r in results]
+                    st.dataframe(to_dataframe(display_data, PRODUCT_SEARCH_DTYPES), width="stretch", hide_index=True)
+                    if submitted:
+                        st.session_state.messages.append(f"총 {len(results)}개의 결과가 검색되었습니다.")
+                elif submitted:
                     st.session_state.messages.append("검색 결과가 없습니다.")
             except Exception as e:
-                st.session_state.messages.append(f"검색 오류: {str(e)}")
+                st.error(f"검색 오류: {str(e)}")
 
 # 재고 관리 화면
 def stock_management(supabase: Client):
@@ -265,44 +557,65 @@ def stock_management(supabase: Client):
 
     with tab1:
         try:
-            products = get_data(supabase, "products", "id, product_name, product_code")
-            if products:
-                with st.form("stock_form"):
-                    product_labels = [f"{p['product_name']} ({p['product_code']})" for p in products]
-                    product_label = st.selectbox("상품 선택", product_labels)
-                    product_id = products[product_labels.index(product_label)]["id"]
-                    quantity = st.number_input("수량", min_value=0, value=1)
-                    remarks = st.text_area("비고")
-                    condition = st.selectbox("상태", CONDITION_OPTIONS)
-                    image_url = st.text_input("이미지 URL")
-                    submit = st.form_submit_button("등록")
-
-                    if submit:
-                        data = {"product_id": product_id, "quantity": quantity, "remarks": remarks,
-                                "condition": condition, "image_url": image_url}
-                        is_valid, error_msg = validate_stock_data(data)
-                        if is_valid and insert_data(supabase, "stock", data):
-                            st.session_state.messages.append("재고가 성공적으로 등록되었습니다!")
-                        else:
-                            st.session_state.messages.append(error_msg)
+            query = st.text_input(f"상품 검색 ({LOOKUP_MIN_CHARS}자 이상)", key="stock_product_lookup")
+            if len(query.strip()) >= LOOKUP_MIN_CHARS:
+                products = lookup_products(supabase, query)
+                if products:
+                    with st.form("stock_form"):
+                        _, products_by_label = indexed(products, product_label)
+                        selected_label = st.selectbox("상품 선택", list(products_by_label))
+                        product_id = products_by_label[selected_label]["id"]
+                        quantity = st.number_input("수량", min_value=0, value=1)
+                        remarks = st.text_area("비고")
+                        condition = st.selectbox("상태", CONDITION_OPTIONS)
+                        image_url = st.text_input("이미지 URL")
+                        submit = st.form_submit_button("등록")
+
+                        if submit:
+                            data = {"product_id": product_id, "quantity": quantity, "remarks": remarks,
+                                    "condition": condition, "image_url": image_url}
+                            is_valid, error_msg = validate_stock_data(data)
+                            if is_valid and insert_data(supabase, "stock", data):
+                                st.session_state.messages.append("재고가 성공적으로 등록되었습니다!")
+                            else:
+                                st.session_state.messages.append(error_msg)
+                else:
+                    st.warning("검색된 상품이 없습니다.")
             else:
-                st.warning("등록된 상품이 없습니다.")
+                st.info(f"상품명을 {LOOKUP_MIN_CHARS}자 이상 입력하세요.")
         except Exception as e:
-            st.session_state.messages.append(f"재고 등록 오류: {str(e)}")
+            st.error(f"재고 등록 오류: {str(e)}")
 
     with tab2:
         try:
-            stock_items = supabase.table("stock").select("*, products(product_name, product_code)").execute().data
+            offset = st.session_state.stock_offset
+            stock_items = get_stock_page(supabase, offset)
+            # 조회가 성공했는데 마지막 페이지의 재고가 모두 삭제되었으면 이전 페이지로 이동 (조회 실패는 아래 except에서 표시)
+            if not stock_items and offset > 0:
+                st.session_state.stock_offset = max(0, offset - PAGE_SIZE)
+                st.rerun()
+            col_prev, col_next = st.columns(2)
+            with col_prev:
+                if st.button("이전", key="stock_prev", disabled=offset == 0):
+                    st.session_state.stock_offset = max(0, offset - PAGE_SIZE)
+                    st.rerun()
+            with col_next:
+                if st.button("다음", key="stock_next", disabled=len(stock_items) < PAGE_SIZE):
+                    st.session_state.stock_offset = offset + PAGE_SIZE
+                    st.rerun()
             if stock_items:
-                stock_labels = [f"ID: {s['id']} - {s['products']['product_name']} ({s['products']['product_code']})" for s in stock_items]
-                selected_stock = st.selectbox("재고 선택", stock_labels)
-                stock_data = stock_items[stock_labels.index(selected_stock)]
+                _, stock_by_label = indexed(stock_items, lambda s: f"ID: {s['id']} - {product_label(s['products'])}")
+                selected_stock = st.selectbox("재고 선택", list(stock_by_label))
+                stock_data = stock_by_label[selected_stock]
+                # 상품 후보: 현재 연결된 상품 + 검색한 상품 (전체 상품 목록은 불러오지 않음)
+                products = [{"id": stock_data["product_id"], **stock_data["products"]}]
+                query = st.text_input(f"변경할 상품 검색 ({LOOKUP_MIN_CHARS}자 이상)", key="stock_update_product_lookup")
+                if len(query.strip()) >= LOOKUP_MIN_CHARS:
+                    products += [p for p in lookup_products(supabase, query) if p["id"] != stock_data["product_id"]]
                 with st.form("update_stock_form"):
-                    products = get_data(supabase, "products", "id, product_name, product_code")
-                    product_labels = [f"{p['product_name']} ({p['product_code']})" for p in products]
-                    product_label = st.selectbox("상품 선택", product_labels,
-                                                 index=product_labels.index(f"{stock_data['products']['product_name']} ({stock_data['products']['product_code']})"))
-                    product_id = products[product_labels.index(product_label)]["id"]
+                    _, products_by_label = indexed(products, product_label)
+                    selected_label = st.selectbox("상품 선택", list(products_by_label))
+                    product_id = products_by_label[selected_label]["id"]
                     quantity = st.number_input("수량", min_value=0, value=stock_data["quantity"])
                     remarks = st.text_area("비고", stock_data["remarks"] or "")
                     condition = st.selectbox("상태", CONDITION_OPTIONS, index=CONDITION_OPTIONS.index(stock_data["condition"]))
@@ -321,33 +634,37 @@ def stock_management(supabase: Client):
                             st.session_state.messages.append("재고가 성공적으로 업데이트되었습니다!")
                         else:
                             st.session_state.messages.append(error_msg)
-                    if delete and delete_data(supabase, "stock", stock_data["id"]):
-                        st.session_state.messages.append("재고가 성공적으로 삭제되었습니다!")
+                    if delete:
+                        is_deleted, error_msg = delete_data(supabase, "stock", stock_data["id"])
+                        st.session_state.messages.append("재고가 성공적으로 삭제되었습니다!" if is_deleted else error_msg)
             else:
                 st.warning("등록된 재고가 없습니다.")
         except Exception as e:
-            st.session_state.messages.append(f"재고 업데이트/삭제 오류: {str(e)}")
+            st.error(f"재고 업데이트/삭제 오류: {str(e)}")
 
     with tab3:
-        search_term = st.text_input("검색어 입력")
+        with st.form("stock_search_form"):
+            search_term = st.text_input("검색어 입력")
+            submitted = st.form_submit_button("검색")
         if search_term:
             try:
-                product_results = search_data(supabase, "products", search_term)
+                product_results = session_search("products", search_term, lambda term: search_data(supabase, term), submitted)
                 if product_results:
                     product_ids = [p["id"] for p in product_results]
-                    stock_results = [s for pid in product_ids for s in get_data(supabase, "stock", "*", {"product_id": pid})]
+                    stock_results = get_stock_by_product_ids(supabase, product_ids, STOCK_SEARCH_COLUMNS)
                     if stock_results:
                         product_dict = {p["id"]: p for p in product_results}
                         display_data = [{"재고 ID": s["id"], "제품명": product_dict[s["product_id"]]["product_name"],
                                          "수량": s["quantity"], "상태": s["condition"]} for s in stock_results]
-                        st.dataframe(display_data)
-                        st.session_state.messages.append(f"총 {len(stock_results)}개의 재고가 검색되었습니다.")
-                    else:
+                        st.dataframe(to_dataframe(display_data, STOCK_SEARCH_DTYPES), width="stretch", hide_index=True)
+                        if submitted:
+                            st.session_state.messages.append(f"총 {len(stock_results)}개의 재고가 검색되었습니다.")
+                    elif submitted:
                         st.session_state.messages.append("재고 정보가 없습니다.")
-                else:
+                elif submitted:
                     st.session_state.messages.append("검색 결과가 없습니다.")
             except Exception as e:
-                st.session_state.messages.append(f"재고 검색 오류: {str(e)}")
+                st.error(f"재고 검색 오류: {str(e)}")
 
 # 브랜드 관리 화면
 def brand_management(supabase: Client):
@@ -368,7 +685,7 @@ def brand_management(supabase: Client):
                     st.session_state.messages.append(f"브랜드 추가 오류: {str(e)}")
 
     with col2:
-        brands = get_brands(supabase)
+        brands = load_lookup(get_brands, supabase, [])
         if brands:
             for brand in brands:
                 col_info, col_delete = st.columns([3, 1])
@@ -377,11 +694,12 @@ def brand_management(supabase: Client):
                 with col_delete:
                     if st.button("삭제", key=f"delete_brand_{brand['id']}"):
                         try:
-                            products = get_data(supabase, "products", "*", {"brand_id": brand['id']})
-                            if products:
-                                st.session_state.messages.append(f"연결된 상품이 {len(products)}개 있어 삭제할 수 없습니다.")
-                            elif delete_data(supabase, "brands", brand['id']):
-                                st.session_state.messages.append(f"브랜드 '{brand['brand_name']}'이 삭제되었습니다!")
+                            product_count = count_data(supabase, "products", {"brand_id": brand['id']})
+                            if product_count:
+                                st.session_state.messages.append(f"연결된 상품이 {product_count}개 있어 삭제할 수 없습니다.")
+                            else:
+                                is_deleted, error_msg = delete_data(supabase, "brands", brand['id'])
+                                st.session_state.messages.append(f"브랜드 '{brand['brand_name']}'이 삭제되었습니다!" if is_deleted else error_msg)
                         except Exception as e:
                             st.session_state.messages.append(f"브랜드 삭제 오류: {str(e)}")
         else:
@@ -408,7 +726,7 @@ def partgroup_management(supabase: Client):
                         st.session_state.messages.append(f"그룹 1 추가 오류: {str(e)}")
 
         with col2:
-            group1_list = get_partgroup1(supabase)
+            group1_list = load_lookup(get_part_groups_tree, supabase, {}).get(None, [])
             if group1_list:
                 for group in group1_list:
                     col_info, col_delete = st.columns([3, 1])
@@ -417,11 +735,11 @@ def partgroup_management(supabase: Client):
                     with col_delete:
                         if st.button("삭제", key=f"delete_group1_{group['id']}"):
                             try:
-                                subgroup = get_partgroup2(supabase, group['id'])  # 하위 그룹 확인
-                                if subgroup:
-                                    st.session_state.messages.append(f"하위 그룹이 {len(subgroup)}개 있어 삭제할 수 없습니다.")
-                                elif delete_data(supabase, "part_groups", group['id']):
-                                    st.session_state.messages.append(f"그룹 '{group['group_name']}'이 삭제되었습니다!")
+                                if exists(supabase, "part_groups", {"parent_id": group['id']}):  # 하위 그룹 확인
+                                    st.session_state.messages.append("하위 그룹이 있어 삭제할 수 없습니다.")
+                                else:
+                                    is_deleted, error_msg = delete_data(supabase, "part_groups", group['id'])
+                                    st.session_state.messages.append(f"그룹 '{group['group_name']}'이 삭제되었습니다!" if is_deleted else error_msg)
                             except Exception as e:
                                 st.session_state.messages.append(f"그룹 1 삭제 오류: {str(e)}")
             else:
@@ -431,11 +749,11 @@ def partgroup_management(supabase: Client):
         col1, col2 = st.columns(2)
         with col1:
             with st.form("add_group2_form"):
-                group1_list = get_partgroup1(supabase)
+                group1_list, group1_by_name = indexed(load_lookup(get_part_groups_tree, supabase, {}).get(None, []), "group_name")
                 parent_id = None
                 if group1_list:
-                    group1_name = st.selectbox("상위 그룹 선택", [g["group_name"] for g in group1_list])
-                    parent_id = next((g["id"] for g in group1_list if g["group_name"] == group1_name), None)
+                    group1_name = st.selectbox("상위 그룹 선택", list(group1_by_name))
+                    parent_id = group1_by_name[group1_name]["id"]
                 group_name = st.text_input("그룹 2 이름")
                 submit = st.form_submit_button("추가", disabled=not parent_id)
                 if submit:
@@ -449,9 +767,9 @@ def partgroup_management(supabase: Client):
 
         with col2:
             if group1_list:
-                selected_group1 = st.selectbox("상위 그룹 필터", [g["group_name"] for g in group1_list])
-                selected_group1_id = next((g["id"] for g in group1_list if g["group_name"] == selected_group1), None)
-                group2_list = get_partgroup2(supabase, selected_group1_id)
+                selected_group1 = st.selectbox("상위 그룹 필터", list(group1_by_name))
+                selected_group1_id = group1_by_name[selected_group1]["id"]
+                group2_list = load_lookup(get_part_groups_tree, supabase, {}).get(selected_group1_id, [])
                 if group2_list:
                     for group in group2_list:
                         col_info, col_delete = st.columns([3, 1])
@@ -460,11 +778,12 @@ def partgroup_management(supabase: Client):
                         with col_delete:
                             if st.button("삭제", key=f"delete_group2_{group['id']}"):
                                 try:
-                                    products = get_data(supabase, "products", "*", {"partgroup2_id": group['id']})
-                                    if products:
-                                        st.session_state.messages.append(f"연결된 상품이 {len(products)}개 있어 삭제할 수 없습니다.")
-                                    elif delete_data(supabase, "part_groups", group['id']):
-                                        st.session_state.messages.append(f"그룹 '{group['group_name']}'이 삭제되었습니다!")
+                                    product_count = count_data(supabase, "products", {"partgroup2_id": group['id']})
+                                    if product_count:
+                                        st.session_state.messages.append(f"연결된 상품이 {product_count}개 있어 삭제할 수 없습니다.")
+                                    else:
+                                        is_deleted, error_msg = delete_data(supabase, "part_groups", group['id'])
+                                        st.session_state.messages.append(f"그룹 '{group['group_name']}'이 삭제되었습니다!" if is_deleted else error_msg)
                                 except Exception as e:
                                     st.session_state.messages.append(f"그룹 2 삭제 오류: {str(e)}")
                 else:
@@ -473,26 +792,28 @@ def partgroup_management(supabase: Client):
                 st.info("부품 그룹 1이 없습니다.")
 
     with tab3:
-        search_term = st.text_input("그룹 검색어 입력")
+        with st.form("partgroup_search_form"):
+            search_term = st.text_input("그룹 검색어 입력")
+            submitted = st.form_submit_button("검색")
         if search_term:
             try:
-                group1_results = search_partgroup(supabase, search_term, True)
-                group2_results = search_partgroup(supabase, search_term, False)
+                group1_results = session_search("part_groups_1", search_term, lambda term: search_partgroup(supabase, term, True), submitted)
+                group2_results = session_search("part_groups_2", search_term, lambda term: search_partgroup(supabase, term, False), submitted)
                 if group1_results or group2_results:
                     st.write("그룹 1 결과:")
-                    st.dataframe(group1_results)
+                    st.dataframe(to_dataframe(group1_results, PARTGROUP_SEARCH_DTYPES), width="stretch", hide_index=True)
                     st.write("그룹 2 결과:")
-                    st.dataframe(group2_results)
-                    st.session_state.messages.append(f"그룹 1: {len(group1_results)}, 그룹 2: {len(group2_results)}개 검색됨")
-                else:
+                    st.dataframe(to_dataframe(group2_results, PARTGROUP_SEARCH_DTYPES), width="stretch", hide_index=True)
+                    if submitted:
+                        st.session_state.messages.append(f"그룹 1: {len(group1_results)}, 그룹 2: {len(group2_results)}개 검색됨")
+                elif submitted:
                     st.session_state.messages.append("검색 결과가 없습니다.")
             except Exception as e:
-                st.session_state.messages.append(f"그룹 검색 오류: {str(e)}")
+                st.error(f"그룹 검색 오류: {str(e)}")
 
 # 메인 앱
 def main():
     st.title("재고 관리 시스템")
-    supabase = st.session_state.supabase
     if supabase:
         menu = st.sidebar.selectbox("메뉴", ["상품 관리", "재고 관리", "브랜드 관리", "부품 그룹 관리"])
         if menu == "상품 관리":
@@ -504,11 +825,15 @@ def main():
         elif menu == "부품 그룹 관리":
             partgroup_management(supabase)
 
-        # 메시지 표시 및 초기화
-        if st.session_state.messages:
-            for msg in st.session_state.messages:
-                st.info(msg)
-            st.session_state.messages = []
+        # 세션 첫 화면을 그린 뒤 나머지 화면의 조회 데이터를 미리 가져옴
+        if not st.session_state.prefetched:
+            prefetch_lookups(supabase)
+            st.session_state.prefetched = True
+
+        # 작업 결과 메시지를 토스트 알림으로 표시 후 초기화 (비우지 않으면 다음 실행 때 다시 표시됨)
+        # 화면을 그리는 중 발생한 조회 오류는 실행마다 반복되므로 토스트 대신 해당 위치에 st.error로 표시
+        while st.session_state.messages:
+            st.toast(st.session_state.messages.popleft())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,19 @@
+-- 상품 검색: 네 개 코드 컬럼에 대한 ILIKE OR 검색을 트라이그램 GIN 인덱스로 처리
+create extension if not exists pg_trgm;
+
+create index if not exists products_search_trgm on products using gin (
+    (coalesce(product_name, '') || ' ' || coalesce(product_code, '') || ' ' ||
+     coalesce(genuine_code, '') || ' ' || coalesce(compatible_code, '')) gin_trgm_ops
+);
+
+-- 인덱스 식과 동일한 식으로 필터링해야 인덱스가 사용됨
+create or replace function search_products(term text)
+returns setof products
+language sql
+stable
+as $$
+    select *
+    from products
+    where (coalesce(product_name, '') || ' ' || coalesce(product_code, '') || ' ' ||
+           coalesce(genuine_code, '') || ' ' || coalesce(compatible_code, '')) ilike '%' || term || '%';
+$$;
@@ -0,0 +1,13 @@
+-- 참조 중인 행은 삭제할 수 없도록 외래 키를 ON DELETE RESTRICT로 재정의
+-- (앱은 23503 foreign_key_violation을 받아 삭제 불가 메시지를 표시)
+alter table products drop constraint if exists products_brand_id_fkey,
+    add constraint products_brand_id_fkey foreign key (brand_id) references brands (id) on delete restrict;
+
+alter table products drop constraint if exists products_partgroup2_id_fkey,
+    add constraint products_partgroup2_id_fkey foreign key (partgroup2_id) references part_groups (id) on delete restrict;
+
+alter table part_groups drop constraint if exists part_groups_parent_id_fkey,
+    add constraint part_groups_parent_id_fkey foreign key (parent_id) references part_groups (id) on delete restrict;
+
+alter table stock drop constraint if exists stock_product_id_fkey,
+    add constraint stock_product_id_fkey foreign key (product_id) references products (id) on delete restrict;
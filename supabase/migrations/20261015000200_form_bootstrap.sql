@@ -0,0 +1,41 @@
+-- 상품 폼 드롭다운 데이터(브랜드 + 부품 그룹)를 미리 직렬화해 두는 구체화 뷰
+create materialized view if not exists form_bootstrap as
+select
+    1 as id,
+    jsonb_build_object(
+        'brands', coalesce((select jsonb_agg(row_to_json(b) order by b.id) from brands b), '[]'::jsonb),
+        'part_groups', coalesce((select jsonb_agg(row_to_json(pg) order by pg.id) from part_groups pg), '[]'::jsonb)
+    ) as payload;
+
+-- refresh ... concurrently에는 유니크 인덱스가 필요
+create unique index if not exists form_bootstrap_id on form_bootstrap (id);
+
+create or replace function refresh_form_bootstrap()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    refresh materialized view concurrently form_bootstrap;
+    return null;
+end;
+$$;
+
+drop trigger if exists brands_refresh_form_bootstrap on brands;
+create trigger brands_refresh_form_bootstrap
+    after insert or update or delete or truncate on brands
+    for each statement execute function refresh_form_bootstrap();
+
+drop trigger if exists part_groups_refresh_form_bootstrap on part_groups;
+create trigger part_groups_refresh_form_bootstrap
+    after insert or update or delete or truncate on part_groups
+    for each statement execute function refresh_form_bootstrap();
+
+create or replace function get_form_bootstrap()
+returns jsonb
+language sql
+stable
+as $$
+    select payload from form_bootstrap;
+$$;
@@ -0,0 +1,14 @@
+-- search_products가 화면에 표시하는 컬럼만 반환하도록 변경 (remarks, image_url 등 제외)
+-- 반환 형식이 바뀌므로 함수를 삭제 후 다시 생성
+drop function if exists search_products(text);
+
+create function search_products(term text)
+returns table (id bigint, product_name text, product_code text, brand_id bigint, condition text)
+language sql
+stable
+as $$
+    select p.id::bigint, p.product_name::text, p.product_code::text, p.brand_id::bigint, p.condition::text
+    from products p
+    where (coalesce(p.product_name, '') || ' ' || coalesce(p.product_code, '') || ' ' ||
+           coalesce(p.genuine_code, '') || ' ' || coalesce(p.compatible_code, '')) ilike '%' || term || '%';
+$$;
@@ -0,0 +1,33 @@
+-- form_bootstrap 구체화 뷰는 RLS가 적용되지 않으므로 REST API(/rest/v1/form_bootstrap)로 노출되지 않는
+-- private 스키마로 옮기고, 폼 데이터는 get_form_bootstrap RPC로만 조회
+create schema if not exists private;
+revoke all on schema private from public, anon, authenticated;
+
+alter materialized view if exists public.form_bootstrap set schema private;
+revoke all on private.form_bootstrap from public, anon, authenticated;
+
+create or replace function refresh_form_bootstrap()
+returns trigger
+language plpgsql
+security definer
+set search_path = ''
+as $$
+begin
+    refresh materialized view concurrently private.form_bootstrap;
+    return null;
+end;
+$$;
+
+-- 호출자는 private 스키마 권한이 없으므로 소유자 권한으로 실행
+create or replace function get_form_bootstrap()
+returns jsonb
+language sql
+stable
+security definer
+set search_path = ''
+as $$
+    select payload from private.form_bootstrap;
+$$;
+
+revoke all on function get_form_bootstrap() from public;
+grant execute on function get_form_bootstrap() to anon, authenticated;